@@ -0,0 +1,44 @@
+"""JSON serialization shared by the DataEntry data managers."""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional, the standard library json is used instead
+    orjson = None
+
+
+def loads(raw: bytes) -> Any:
+    """Parse JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize data compactly, or with a 2-space indent when pretty is set.
+
+    numpy scalars are accepted with either library, and both produce the same
+    layout, so files don't change shape depending on what is installed.
+
+    Parameters:
+    -----------
+    data : Any
+        JSON-serializable data
+    pretty : bool
+        Write indented JSON instead of the compact form
+
+    Returns:
+    --------
+    bytes
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
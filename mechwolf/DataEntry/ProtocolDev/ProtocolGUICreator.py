@@ -69,9 +69,11 @@ class ProtocolGUI:
         self.full_config = (
             self.data_manager.load_full_config() if self.data_manager else None
         )
-        # Load protocol config separately
+        # Pick the protocol config out of the already loaded file
         self.existing_config = (
-            self.data_manager.load_protocol_config() if self.data_manager else None
+            self.data_manager.load_protocol_config(self.full_config)
+            if self.data_manager
+            else None
         )
 
         self.create_widgets()
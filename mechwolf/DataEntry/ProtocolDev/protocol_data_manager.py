@@ -1,6 +1,8 @@
 import json
 from typing import Any, Dict, Optional
 
+from mechwolf.DataEntry import JSONUtils
+
 
 class ProtocolDataManager:
     """
@@ -10,9 +12,9 @@ class ProtocolDataManager:
     Methods:
         load_full_config() -> Optional[Dict[str, Any]]:
             Loads the entire configuration file.
-        load_protocol_config() -> Optional[Dict[str, Any]]:
-            Loads the existing protocol configuration from the JSON file.
-        save_protocol_config(protocol_config: Dict[str, Any]) -> None:
+        load_protocol_config(full_config: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+            Loads the existing protocol configuration from the JSON file or a loaded configuration.
+        save_protocol_config(protocol_config: Dict[str, Any], pretty: bool = False) -> None:
             Saves the protocol configuration while preserving all existing data.
     """
 
@@ -28,20 +30,31 @@ class ProtocolDataManager:
             print(f"Error loading full configuration: {str(e)}")
             return None
 
-    def load_protocol_config(self) -> Optional[Dict[str, Any]]:
-        """Load existing protocol configuration from JSON file"""
-        try:
-            with open(self.json_file, "r") as f:
-                data = json.load(f)
-                if isinstance(data, dict) and "protocol_configs" in data:
-                    if data["protocol_configs"]:
-                        return data["protocol_configs"][-1]
-        except (FileNotFoundError, json.JSONDecodeError):
-            pass
+    def load_protocol_config(
+        self, full_config: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Load existing protocol configuration from JSON file, or from an
+        already loaded full configuration to avoid parsing the file again"""
+        data = full_config
+        if data is None:
+            try:
+                with open(self.json_file, "r") as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+        if isinstance(data, dict) and "protocol_configs" in data:
+            if data["protocol_configs"]:
+                return data["protocol_configs"][-1]
         return None
 
-    def save_protocol_config(self, protocol_config: Dict[str, Any]) -> None:
-        """Save protocol configuration while preserving ALL existing data"""
+    # Shared with the reagent data manager
+    _dumps = staticmethod(JSONUtils.dumps)
+
+    def save_protocol_config(
+        self, protocol_config: Dict[str, Any], pretty: bool = False
+    ) -> None:
+        """Save protocol configuration while preserving ALL existing data.
+        The file is written compactly unless pretty is set for hand editing"""
         try:
             # Read existing data
             with open(self.json_file, "r") as f:
@@ -71,6 +84,10 @@ class ProtocolDataManager:
         found = False
         for i, existing_protocol in enumerate(data["protocol_configs"]):
             if existing_protocol.get("name") == new_entry["name"]:
+                if existing_protocol == new_entry:
+                    # Nothing changed, so skip re-serializing the whole file
+                    print(f"Protocol '{new_entry['name']}' is unchanged, nothing to save")
+                    return
                 data["protocol_configs"][i] = new_entry
                 found = True
                 print(f"Updated existing protocol: {new_entry['name']}")
@@ -80,10 +97,10 @@ class ProtocolDataManager:
             data["protocol_configs"].append(new_entry)
             print(f"Added new protocol: {new_entry['name']}")
 
-        # Write back to file with proper formatting
+        # Write back to file
         try:
-            with open(self.json_file, "w") as f:
-                json.dump(data, f, indent=4)
+            with open(self.json_file, "wb") as f:
+                f.write(self._dumps(data, pretty))
             print(f"Successfully wrote data to {self.json_file}")
             print(
                 f"Protocol '{new_entry['name']}' saved with {len(new_entry['pump_entries'])} entries"
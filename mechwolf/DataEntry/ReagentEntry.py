@@ -1,21 +1,70 @@
+import json
+import os
+import threading
+import traceback
+
 import ipywidgets as widgets
-from IPython.display import display, clear_output
+from IPython.display import display, clear_output, HTML
 
 # Import helper modules
 from mechwolf.DataEntry.ReagentUI.DataManager import ReagentDataManager
 from mechwolf.DataEntry.ReagentUI.PubChemService import PubChemService
 from mechwolf.DataEntry.ReagentUI.UIComponents import UIComponents
 from mechwolf.DataEntry.ReagentUI.FormHandlers import ReagentFormHandler, FinalDetailsFormHandler
+from mechwolf.DataEntry.ReagentUI.ReagentUtils import is_rdkit_available, safe_mol_from_smiles
+
+# Layouts shared by the tab contents; none of them are changed after creation
+_TAB_LAYOUT = widgets.Layout(padding="10px")
+_REAGENT_LIST_LAYOUT = widgets.Layout(
+    margin="10px 0 10px 0",
+    border="1px solid #ddd",
+    padding="10px",
+    min_height="100px",
+    max_height="600px",
+    overflow_y="auto"
+)
+_SEARCH_INPUT_LAYOUT = widgets.Layout(width="80%")
+_SEARCH_TYPE_LAYOUT = widgets.Layout(width="50%")
+_SEARCH_INPUT_AREA_LAYOUT = widgets.Layout(margin="10px 0")
+_RESULT_CONTAINER_LAYOUT = widgets.Layout(
+    border="1px solid #ddd",
+    padding="10px",
+    margin="10px 0",
+    max_height="500px",
+    overflow_y="auto"
+)
+
+# Fields every reagent must have before it can be saved
+REQUIRED_FIELDS = ("name", "inChi", "molecular weight (in g/mol)", "eq", "syringe")
+VALID_TYPES = frozenset({"solid", "liquid"})
 
 class ReagentInputForm:
+    # Search status messages
+    _STATUS_NO_QUERY = "<p style='color: orange;'>Please enter a search term</p>"
+    _STATUS_SEARCHING = "<p style='color: blue;'>Searching PubChem...</p>"
+    _STATUS_NO_RESULTS = "<p style='color: red;'>No results found</p>"
+    _STATUS_FOUND_TPL = "<p style='color: green;'>Found {} results</p>"
+    _STATUS_SEARCH_FAILED = "<p style='color: red;'>Search failed. Check console for errors.</p>"
+    
+    # Reagent list headings
+    _SOLID_HEADER = "<h3 style='color: #3F704D; margin: 10px 0 5px 0; border-bottom: 2px solid #90BE6D;'>Solid Reagents</h3>"
+    _LIQUID_HEADER = "<h3 style='color: #3A5D9F; margin: 15px 0 5px 0; border-bottom: 2px solid #577590;'>Liquid Reagents</h3>"
+    _EMPTY_LIST = (
+        "<div style='text-align: center; padding: 20px; color: #666; font-style: italic;'>"
+        "No reagents added yet. Go to the 'Add Reagents' tab to add reagents."
+        "</div>"
+    )
+    
     def __init__(self, data_file: str) -> None:
         """Initialize the form with a data file path."""
         # Initialize data manager
         self.data_manager = ReagentDataManager(data_file)
         self.data_file = data_file
         
-        # Initialize PubChem service
-        self.pubchem_service = PubChemService()
+        # Initialize PubChem service, keeping its search cache next to the data file
+        self.pubchem_service = PubChemService(
+            os.path.join(os.path.dirname(os.path.abspath(data_file)), ".pubchem_cache.json")
+        )
         
         # Main UI components
         self.main_container = None
@@ -30,36 +79,68 @@ class ReagentInputForm:
         self.search_results = None
         self.search_status = None
         
-        # List display
+        # Incremented per search so only the latest one updates the results
+        self._search_token = 0
+        # Guards the token together with the status and results it decides on,
+        # as searches finish on worker threads
+        self._search_lock = threading.Lock()
+        
+        # The current reagents and search tabs are only built once first opened
+        self._reagents_tab_built = False
+        self._search_tab_built = False
+        
+        # Set when the reagent data changes so the final details form is rebuilt;
+        # the hash of the data it was last built from catches no-op changes
+        self._final_details_dirty = True
+        self._last_data_hash = None
+        
+        # List display; rows are cached by id() of their reagent between updates
         self.reagent_list = None
+        self._row_widgets = {}
 
     def setup_ui(self) -> None:
         """Create the main UI structure with tabs."""
         # Create the tab container
         self.tab_container = widgets.Tab()
         
-        # Create tabs
+        # Create tabs; only the first is built now, the others start as empty
+        # placeholders and are filled in when first selected
         self.add_reagents_tab = self.create_add_reagents_tab()
-        self.current_reagents_tab = self.create_current_reagents_tab()
+        self.current_reagents_tab = widgets.VBox()
         self.final_details_tab = self.create_final_details_tab()
-        self.search_tab = self.create_search_tab()
+        self.search_tab = widgets.VBox()
+        self.reagent_list = None
+        self._row_widgets = {}
+        self._reagents_tab_built = False
+        self._search_tab_built = False
+        self._final_details_dirty = True
+        self._last_data_hash = None
+        
+        # Set the tab children and titles in one sync message
+        with self.tab_container.hold_sync():
+            self.tab_container.children = [
+                self.add_reagents_tab,
+                self.current_reagents_tab,
+                self.search_tab,
+                self.final_details_tab
+            ]
+            self.tab_container.set_title(0, "Add Reagents")
+            self.tab_container.set_title(1, "Current Reagents")
+            self.tab_container.set_title(2, "Search Chemical")
+            self.tab_container.set_title(3, "Final Details")
+        
+        # Add tab selection handlers to build the reagent list and search tabs
+        # on first use and refresh the final details tab when selected
+        self._tab_handlers = {
+            1: self._ensure_reagents_tab,
+            2: self._ensure_search_tab,
+            3: self.refresh_final_details_tab
+        }
         
-        # Set the tab children and titles
-        self.tab_container.children = [
-            self.add_reagents_tab,
-            self.current_reagents_tab,
-            self.search_tab,
-            self.final_details_tab
-        ]
-        self.tab_container.set_title(0, "Add Reagents")
-        self.tab_container.set_title(1, "Current Reagents")
-        self.tab_container.set_title(2, "Search Chemical")
-        self.tab_container.set_title(3, "Final Details")
-        
-        # Add tab selection handler to refresh the final details tab when selected
         def on_tab_selected(change):
-            if change['new'] == 3:  # Final Details tab index
-                self.refresh_final_details_tab()
+            handler = self._tab_handlers.get(change['new'])
+            if handler:
+                handler()
                 
         self.tab_container.observe(on_tab_selected, names='selected_index')
         
@@ -71,9 +152,30 @@ class ReagentInputForm:
         
         # Display the main container
         display(self.main_container)
-        
-        # Update the reagent list
+
+    def _swap_tab(self, index: int, tab: widgets.Widget) -> None:
+        """Replace the placeholder at index with the built tab."""
+        children = list(self.tab_container.children)
+        children[index] = tab
+        self.tab_container.children = tuple(children)
+
+    def _ensure_reagents_tab(self) -> None:
+        """Build and fill the current reagents tab, once."""
+        if self._reagents_tab_built:
+            return
+        self.current_reagents_tab = self.create_current_reagents_tab()
+        self._reagents_tab_built = True
+        # Fill the list before swapping it in so it ships with the tab
         self.update_reagent_list()
+        self._swap_tab(1, self.current_reagents_tab)
+
+    def _ensure_search_tab(self) -> None:
+        """Build the search tab and swap it in for its placeholder, once."""
+        if self._search_tab_built:
+            return
+        self.search_tab = self.create_search_tab()
+        self._search_tab_built = True
+        self._swap_tab(2, self.search_tab)
 
     def create_add_reagents_tab(self) -> widgets.Widget:
         """Create the tab content for adding reagents."""
@@ -92,48 +194,41 @@ class ReagentInputForm:
             on_save=self.save_reagent
         )
         
-        # Set accordion children and titles
-        reagent_accordion.children = [solid_form, liquid_form]
-        reagent_accordion.set_title(0, "Solid Reagent")
-        reagent_accordion.set_title(1, "Liquid Reagent")
+        # Set accordion children and titles in one sync message
+        with reagent_accordion.hold_sync():
+            reagent_accordion.children = [solid_form, liquid_form]
+            reagent_accordion.set_title(0, "Solid Reagent")
+            reagent_accordion.set_title(1, "Liquid Reagent")
         
         # Return the complete tab content
         return widgets.VBox([
             widgets.HTML("<h4>Add New Reagents</h4>"),
             reagent_accordion
-        ], layout=widgets.Layout(padding="10px"))
+        ], layout=_TAB_LAYOUT)
 
     def create_current_reagents_tab(self) -> widgets.Widget:
         """Create the tab content for viewing current reagents."""
         # Create reagent list container
-        self.reagent_list = widgets.VBox(
-            layout=widgets.Layout(
-                margin="10px 0 10px 0",
-                border="1px solid #ddd",
-                padding="10px",
-                min_height="100px"
-            )
-        )
+        self.reagent_list = widgets.VBox(layout=_REAGENT_LIST_LAYOUT)
+        self._row_widgets = {}
+        
+        # Headings and empty-list notice, reused on every update
+        self._solid_header = widgets.HTML(self._SOLID_HEADER)
+        self._liquid_header = widgets.HTML(self._LIQUID_HEADER)
+        self._empty_list_notice = widgets.HTML(self._EMPTY_LIST)
         
         # Return the complete tab content
         return widgets.VBox([
             widgets.HTML("<h4>Current Reagents</h4>"),
             self.reagent_list
-        ], layout=widgets.Layout(padding="10px"))
+        ], layout=_TAB_LAYOUT)
     
     def create_final_details_tab(self) -> widgets.Widget:
-        """Create the tab content for entering final details."""
-        # Create the final details form
-        form = FinalDetailsFormHandler.create_final_details_form(
-            self.data_manager.data,
-            on_submit=self.process_final_details
-        )
+        """Create the container for the final details tab.
         
-        # Return the complete tab content
-        return widgets.VBox([
-            widgets.HTML("<h4>Final Details and Submission</h4>"),
-            form
-        ], layout=widgets.Layout(padding="10px"))
+        The form itself is built by refresh_final_details_tab when the tab is selected.
+        """
+        return widgets.VBox(layout=_TAB_LAYOUT)
 
     def create_search_tab(self) -> widgets.Widget:
         """Create the tab content for searching chemicals from PubChem."""
@@ -141,14 +236,14 @@ class ReagentInputForm:
         self.search_input = widgets.Text(
             placeholder="Enter chemical name, SMILES, InChI, or CAS",
             description="Search:",
-            layout=widgets.Layout(width="80%")
+            layout=_SEARCH_INPUT_LAYOUT
         )
         
         search_type = widgets.Dropdown(
             options=['Name', 'SMILES', 'InChI', 'InChI Key', 'CAS'],
             value='Name',
             description='Search by:',
-            layout=widgets.Layout(width="50%")
+            layout=_SEARCH_TYPE_LAYOUT
         )
         
         search_button = widgets.Button(
@@ -167,34 +262,24 @@ class ReagentInputForm:
         def on_search_click(b):
             query = self.search_input.value.strip()
             if not query:
-                self.search_status.value = "<p style='color: orange;'>Please enter a search term</p>"
+                self.search_status.value = self._STATUS_NO_QUERY
                 return
                 
-            self.search_status.value = "<p style='color: blue;'>Searching PubChem...</p>"
-            self.search_results.children = ()
-            
-            # Perform the search
-            results = self.pubchem_service.search(query, search_type.value.lower())
+            with self._search_lock:
+                self._search_token += 1
+                token = self._search_token
+                self.search_status.value = self._STATUS_SEARCHING
+                old_results = self.search_results.children
+                self.search_results.children = ()
+            for old_result in old_results:
+                UIComponents.close_widget(old_result)
             
-            if not results:
-                self.search_status.value = "<p style='color: red;'>No results found</p>"
-                return
-                
-            self.search_status.value = f"<p style='color: green;'>Found {len(results)} results</p>"
-            
-            # Create result widgets
-            result_widgets = []
-            for compound in results:
-                # Create a copy of the compound data for each result to avoid reference issues
-                compound_copy = compound.copy()
-                result_widget = UIComponents.create_search_result_widget(
-                    compound_copy,
-                    on_import_solid=self.import_from_pubchem_solid,
-                    on_import_liquid=self.import_from_pubchem_liquid
-                )
-                result_widgets.append(result_widget)
-                
-            self.search_results.children = tuple(result_widgets)
+            # Perform the search in the background so the kernel stays responsive
+            threading.Thread(
+                target=self._run_search,
+                args=(query, search_type.value.lower(), token),
+                daemon=True
+            ).start()
             
         search_button.on_click(on_search_click)
         
@@ -203,81 +288,139 @@ class ReagentInputForm:
             widgets.HBox([self.search_input, search_type]), 
             search_button,
             self.search_status
-        ], layout=widgets.Layout(margin="10px 0"))
+        ], layout=_SEARCH_INPUT_AREA_LAYOUT)
         
         # Results area with scrolling
         results_container = widgets.VBox([
             widgets.HTML("<h4>Search Results</h4>"),
             self.search_results
-        ], layout=widgets.Layout(
-            border="1px solid #ddd",
-            padding="10px",
-            margin="10px 0",
-            max_height="500px",
-            overflow_y="auto"
-        ))
+        ], layout=_RESULT_CONTAINER_LAYOUT)
         
         # Return the complete tab content
         return widgets.VBox([
             widgets.HTML("<h4>Search Chemical Databases</h4>"),
             input_area,
             results_container
-        ], layout=widgets.Layout(padding="10px"))
+        ], layout=_TAB_LAYOUT)
+
+    def _run_search(self, query: str, search_type: str, token: int) -> None:
+        """Search PubChem and show the results, unless a newer search was started."""
+        # This runs on a worker thread, so failures must end up in the status
+        # rather than leaving it on "Searching PubChem..."
+        result_widgets = []
+        try:
+            self._show_search_results(query, search_type, token, result_widgets)
+        except Exception:
+            traceback.print_exc()
+            for result_widget in result_widgets:
+                UIComponents.close_widget(result_widget)
+            with self._search_lock:
+                if token == self._search_token:
+                    self.search_status.value = self._STATUS_SEARCH_FAILED
+
+    def _show_search_results(self, query: str, search_type: str, token: int,
+                             result_widgets: list) -> None:
+        """Run the search and fill result_widgets, then show them if still current."""
+        results = self.pubchem_service.search(query, search_type)
+        
+        # Don't build widgets for a search that has already been superseded
+        if token != self._search_token:
+            return
+            
+        if not results:
+            with self._search_lock:
+                if token == self._search_token:
+                    self.search_status.value = self._STATUS_NO_RESULTS
+            return
+            
+        # Create result widgets
+        for compound in results:
+            # Create a copy of the compound data for each result to avoid reference issues
+            compound_copy = compound.copy()
+            result_widget = UIComponents.create_search_result_widget(
+                compound_copy,
+                on_import_solid=self.import_from_pubchem_solid,
+                on_import_liquid=self.import_from_pubchem_liquid
+            )
+            result_widgets.append(result_widget)
+            
+        # Show the results only if no newer search started meanwhile; otherwise
+        # they are closed here, as nothing else will ever see them
+        with self._search_lock:
+            current = token == self._search_token
+            if current:
+                self.search_status.value = self._STATUS_FOUND_TPL.format(len(results))
+                self.search_results.children = tuple(result_widgets)
+        if not current:
+            for result_widget in result_widgets:
+                UIComponents.close_widget(result_widget)
 
     def update_reagent_list(self) -> None:
-        """Update the display of reagent items."""
+        """Update the display of reagent items, reusing rows for unchanged reagents."""
+        # Nothing to update until the tab is first opened; it is filled then
+        if self.reagent_list is None:
+            return
+            
         items = []
-        
-        # Create heading for solid reagents if any exist
-        if self.data_manager.data["solid reagents"]:
-            items.append(widgets.HTML(
-                "<h3 style='color: #3F704D; margin: 10px 0 5px 0; border-bottom: 2px solid #90BE6D;'>Solid Reagents</h3>"
-            ))
-            for reagent in self.data_manager.data["solid reagents"]:
-                item = UIComponents.create_reagent_item(
-                    reagent, 
-                    is_solid=True,
-                    on_edit=self.edit_reagent,
-                    on_delete=self.delete_reagent
-                )
-                items.append(item)
-        
-        # Create heading for liquid reagents if any exist
-        if self.data_manager.data["liquid reagents"]:
-            items.append(widgets.HTML(
-                "<h3 style='color: #3A5D9F; margin: 15px 0 5px 0; border-bottom: 2px solid #577590;'>Liquid Reagents</h3>"
-            ))
-            for reagent in self.data_manager.data["liquid reagents"]:
-                item = UIComponents.create_reagent_item(
-                    reagent, 
-                    is_solid=False,
-                    on_edit=self.edit_reagent,
-                    on_delete=self.delete_reagent
-                )
-                items.append(item)
+        rows = {}
+        solids = self.data_manager.data["solid reagents"]
+        liquids = self.data_manager.data["liquid reagents"]
+        
+        # Add heading for solid reagents if any exist
+        if solids:
+            items.append(self._solid_header)
+            for reagent in solids:
+                items.append(self._reagent_row(reagent, True, rows))
+        
+        # Add heading for liquid reagents if any exist
+        if liquids:
+            items.append(self._liquid_header)
+            for reagent in liquids:
+                items.append(self._reagent_row(reagent, False, rows))
         
         # If no reagents, show a message
         if not items:
-            items.append(widgets.HTML(
-                "<div style='text-align: center; padding: 20px; color: #666; font-style: italic;'>"
-                "No reagents added yet. Go to the 'Add Reagents' tab to add reagents."
-                "</div>"
-            ))
-        
-        # Update the reagent list with the items
-        self.reagent_list.children = tuple(items)
+            items.append(self._empty_list_notice)
+            
+        # Close the rows of reagents that were removed or replaced
+        for key, (reagent, is_solid, row) in self._row_widgets.items():
+            if key not in rows:
+                UIComponents.close_widget(row)
+        self._row_widgets = rows
+        
+        # Update the reagent list in a single sync message, if anything changed
+        items = tuple(items)
+        if items != self.reagent_list.children:
+            with self.reagent_list.hold_sync():
+                self.reagent_list.children = items
+
+    def _reagent_row(self, reagent, is_solid, rows):
+        """Return the row widget for a reagent, building it only if it isn't cached."""
+        cached = self._row_widgets.get(id(reagent))
+        if cached is not None and cached[0] is reagent and cached[1] == is_solid:
+            row = cached[2]
+        else:
+            row = UIComponents.create_reagent_item(
+                reagent, 
+                is_solid=is_solid,
+                on_edit=self.edit_reagent,
+                on_delete=self.delete_reagent
+            )
+        # Keep the reagent alongside its row so its id can't be reused while cached
+        rows[id(reagent)] = (reagent, is_solid, row)
+        return row
 
     def save_reagent(self, new_reagent, old_reagent=None, specified_type=None):
         """Save a reagent to the data."""
+        dm = self.data_manager
+        mw_key = "molecular weight (in g/mol)"
+        den_key = "density (in g/mL)"
         try:
             # Validate we have the minimum required fields
-            required_fields = ["name", "inChi", "molecular weight (in g/mol)", "eq", "syringe"]
-            missing_fields = [field for field in required_fields if field not in new_reagent]
-            
-            if missing_fields:
+            if not all(field in new_reagent for field in REQUIRED_FIELDS):
                 return False
                 
-            if new_reagent["name"].strip() == "":
+            if not new_reagent["name"].strip():
                 return False
             
             # Determine reagent type with better error handling
@@ -288,55 +431,56 @@ class ReagentInputForm:
                 reagent_type = specified_type
             elif old_reagent:
                 # For editing, get the type from data manager
-                reagent_type = self.data_manager.get_reagent_type(old_reagent)
+                reagent_type = dm.get_reagent_type(old_reagent)
             else:
                 # For new reagent, check if it has a density field
-                reagent_type = "liquid" if "density (in g/mL)" in new_reagent else "solid"
+                reagent_type = "liquid" if den_key in new_reagent else "solid"
+            
+            # Ensure we have a valid reagent type before doing any work
+            if reagent_type not in VALID_TYPES:
+                return False
+            
+            # Copy the reagent to avoid reference issues; all values are scalars
+            # so a shallow copy is enough
+            reagent_copy = dict(new_reagent)
             
             # Remove special type field if it exists
-            if "_reagent_type" in new_reagent:
-                del new_reagent["_reagent_type"]
-                
-            # Create a deep copy of the reagent to avoid reference issues
-            import copy
-            reagent_copy = copy.deepcopy(new_reagent)
+            if "_reagent_type" in reagent_copy:
+                del reagent_copy["_reagent_type"]
             
             # Force the values to be the correct types
-            reagent_copy["molecular weight (in g/mol)"] = float(reagent_copy["molecular weight (in g/mol)"])
+            reagent_copy[mw_key] = float(reagent_copy[mw_key])
             reagent_copy["eq"] = float(reagent_copy["eq"])
             reagent_copy["syringe"] = int(reagent_copy["syringe"])
-            if "density (in g/mL)" in reagent_copy:
-                reagent_copy["density (in g/mL)"] = float(reagent_copy["density (in g/mL)"])
-            
-            # Ensure we have a valid reagent type
-            if reagent_type not in ["solid", "liquid"]:
-                return False
+            if den_key in reagent_copy:
+                reagent_copy[den_key] = float(reagent_copy[den_key])
             
             # Add or update the reagent in the data manager
             if old_reagent:
-                self.data_manager.update_reagent(old_reagent, reagent_copy, reagent_type)
+                dm.update_reagent(old_reagent, reagent_copy, reagent_type)
             else:
-                self.data_manager.add_reagent(reagent_copy, reagent_type)
+                dm.add_reagent(reagent_copy, reagent_type)
             
             # Update the reagent list
             self.update_reagent_list()
             
-            # Refresh the final details tab with updated data
-            self.refresh_final_details_tab()
+            # Rebuild the final details form with the new data when next shown
+            self._final_details_dirty = True
             
             # Switch to Current Reagents tab to show the new reagent
             self.tab_container.selected_index = 1
             
             return True
             
-        except Exception as e:
-            import traceback
+        except Exception:
+            # The form tells the user to check the console for the details
             traceback.print_exc()
             return False
 
     def delete_reagent(self, reagent):
         """Remove a reagent from the data."""
         self.data_manager.delete_reagent(reagent)
+        self._final_details_dirty = True
         
         # Update the display
         self.update_reagent_list()
@@ -354,17 +498,11 @@ class ReagentInputForm:
         accordion = self.add_reagents_tab.children[1]  # Get the accordion widget
         accordion.selected_index = accordion_index
         
-        # Create a new form with the reagent data
-        form = ReagentFormHandler.create_reagent_form(
-            reagent_type, 
-            reagent=reagent,
+        # Load the reagent data into the existing form
+        accordion.children[accordion_index].load_reagent(
+            reagent,
             on_save=self.save_reagent
         )
-        
-        # Replace the existing form by creating a new tuple
-        new_children = list(accordion.children)
-        new_children[accordion_index] = form
-        accordion.children = tuple(new_children)
 
     def lookup_chemical(self, name, smiles_input, inchi_input, inchikey_input, mw_input, update_callback):
         """Look up chemical structure by name or SMILES."""
@@ -375,7 +513,11 @@ class ReagentInputForm:
             results = self.pubchem_service.search(name, 'name')
             if results:
                 compound = results[0]
-                smiles_input.value = compound['smiles']
+                smiles = compound['smiles']
+                # Same check as import_from_pubchem: keep unparsable SMILES out of the form
+                if smiles and is_rdkit_available() and not safe_mol_from_smiles(smiles):
+                    smiles = ''
+                smiles_input.value = smiles
                 inchi_input.value = compound['inchi']
                 inchikey_input.value = compound['inchikey']
                 mw_input.value = compound['molecular_weight']
@@ -405,10 +547,20 @@ class ReagentInputForm:
         if inchi and inchi.startswith("InChI="):
             inchi = inchi[6:]  # Remove 'InChI=' prefix
             
+        # Search results carry PubChem's SMILES as is; check it once here, on import
+        warnings = []
+        smiles = compound['smiles']
+        if smiles and is_rdkit_available() and not safe_mol_from_smiles(smiles):
+            warnings.append(
+                f"The SMILES from PubChem ({smiles}) could not be parsed and was left out. "
+                "Please enter it manually."
+            )
+            smiles = ""
+            
         new_reagent = {
             "name": compound['name'],
             "inChi": inchi,
-            "SMILES": compound['smiles'],
+            "SMILES": smiles,
             "inChi Key": compound['inchikey'],
             "molecular weight (in g/mol)": compound['molecular_weight'],
             "eq": 1.0,  # Default to 1.0 equivalents
@@ -418,7 +570,6 @@ class ReagentInputForm:
         
         # Add density for liquids (from PubChem if available, otherwise default)
         has_density = False
-        warning_message = None
         
         if reagent_type == "liquid":
             if compound.get('density') and compound['density'] > 0:
@@ -427,26 +578,26 @@ class ReagentInputForm:
             else:
                 new_reagent["density (in g/mL)"] = 1.0
                 # Set warning message for liquid with no density
-                warning_message = "No density value found in PubChem, using default (1.0 g/mL). Please change this accordingly!"
+                warnings.append("No density value found in PubChem, using default (1.0 g/mL). Please change this accordingly!")
         
-        # Create a new form with the compound data
-        form = ReagentFormHandler.create_reagent_form(
-            reagent_type, 
-            reagent=new_reagent,
+        # Load the compound data into the existing form
+        accordion.children[accordion_index].load_reagent(
+            new_reagent,
             on_save=lambda new, old=None: self.save_reagent(new, old, specified_type=reagent_type),
-            warning_message=warning_message  # Pass warning message to form
+            warning_message=" ".join(warnings) or None,  # Pass warning message to form
+            flag_density=reagent_type == "liquid" and not has_density
         )
         
-        # Replace the existing form with a new tuple
-        new_children = list(accordion.children)
-        new_children[accordion_index] = form
-        accordion.children = tuple(new_children)
-        
         # Display success message - simplified to avoid redundant density warning
         success_message = f"<p style='color: green;'>Data imported as {reagent_type}."
         if reagent_type == "liquid" and has_density:
             success_message += f" Density value ({compound['density']} g/mL) retrieved from PubChem."
         success_message += " Please complete any remaining fields.</p>"
+        if not smiles and compound['smiles']:
+            success_message = (
+                f"<p style='color: #B45309;'>Data imported as {reagent_type}, but the SMILES "
+                "could not be parsed and was left out. Please complete any remaining fields.</p>"
+            )
         self.search_status.value = success_message
 
     def process_final_details(self, mass_scale, concentration, solvent, message_area):
@@ -454,6 +605,7 @@ class ReagentInputForm:
         try:
             # Update data with form values
             self.data_manager.update_final_details(mass_scale, concentration, solvent)
+            self._final_details_dirty = True
             
             # Validate that at least one reagent has eq=1.0
             if not self.data_manager.has_limiting_reagent():
@@ -462,20 +614,18 @@ class ReagentInputForm:
             # Remove the form widgets
             self.main_container.layout.display = 'none'
             
-            # Process data
-            import IPython.display as display
-            import time
+            # Process data; imported here as it pulls in astropy
             from mechwolf.DataEntry.ReagentUI.ProcessData import process_data
             
             # Force a complete reset of output
-            display.clear_output(wait=True)
-            display.display(display.HTML("<h3>Processing Data:</h3>"))
-            
-            # Small delay to ensure file operations complete
-            time.sleep(0.5)
+            clear_output(wait=True)
+            display(HTML("<h3>Processing Data:</h3>"))
             
             # Process the data
-            process_data(self.data_file)
+            process_data(self.data_file, data=self.data_manager.data)
+            
+            # The form is done, so no more PubChem searches will be made
+            self.pubchem_service.close()
             return True
             
         except ValueError as e:
@@ -484,18 +634,30 @@ class ReagentInputForm:
             return False
 
     def refresh_final_details_tab(self):
-        """Refresh the final details tab with current data."""
+        """Refresh the final details tab if the data changed since it was last built."""
+        if not self._final_details_dirty:
+            return
+        self._final_details_dirty = False
+        
+        # Saving an unchanged reagent marks the form dirty without changing the data
+        data_hash = hash(json.dumps(self.data_manager.data, sort_keys=True, default=str))
+        if data_hash == self._last_data_hash:
+            return
+        self._last_data_hash = data_hash
+            
         # Create a new final details form with the latest data
         new_form = FinalDetailsFormHandler.create_final_details_form(
             self.data_manager.data,
             on_submit=self.process_final_details
         )
         
-        # Replace the existing form
-        self.final_details_tab.children = (
-            widgets.HTML("<h4>Final Details and Submission</h4>"),
-            new_form
-        )
+        # Replace the existing form, keeping the heading if there is one
+        old_children = self.final_details_tab.children
+        heading = old_children[0] if old_children else widgets.HTML("<h4>Final Details and Submission</h4>")
+        with self.final_details_tab.hold_sync():
+            self.final_details_tab.children = (heading, new_form)
+        for old_form in old_children[1:]:
+            UIComponents.close_widget(old_form)
 
     def run(self) -> None:
         """Run the application."""
@@ -503,9 +665,9 @@ class ReagentInputForm:
         if not self.data_manager.data["solid reagents"] and not self.data_manager.data["liquid reagents"]:
             self.setup_ui()
         else:
-            # First show the current data as a table
+            # First show the current data as a table; imported here as it pulls in astropy
             from mechwolf.DataEntry.ReagentUI.ProcessData import process_data
-            process_data(self.data_file)
+            process_data(self.data_file, data=self.data_manager.data)
             
             # Then ask if user wants to edit or proceed
             display(widgets.HTML("<h3>What would you like to do with this data?</h3>"))
@@ -1,6 +1,26 @@
 """Data management functions for reagent entry."""
+import functools
 import json
-from typing import Dict, Any
+import os
+import threading
+from itertools import chain
+from typing import Dict, Any, Optional, Tuple
+
+from mechwolf.DataEntry import JSONUtils
+
+# Buffer size for reading and writing the reagent data file
+IO_BUFFER_SIZE = 65536
+
+# Seconds to wait for further reagent changes before writing them to disk
+SAVE_DELAY = 0.5
+
+def _locked(method):
+    """Run a method while holding the manager's lock, as saves may run on a timer thread."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class ReagentDataManager:
     """Manages reagent data loading, saving, and validation."""
@@ -16,6 +36,16 @@ class ReagentDataManager:
         """
         self.data_file = data_file
         self.data = {"solid reagents": [], "liquid reagents": []}
+        # Maps id() of each stored reagent dict to its data key, so lookups
+        # don't have to compare every field of every reagent
+        self._index: Dict[int, str] = {}
+        # Reagent changes are written by a timer so bursts of edits share one save
+        self._lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+        # Bytes last written to the data file and the file's (mtime, size) right
+        # after, so a save is skipped only while the file on disk is still ours
+        self._last_saved: Optional[bytes] = None
+        self._last_saved_stat: Optional[Tuple[int, int]] = None
         self.load_data()
         
     def load_data(self) -> Dict[str, Any]:
@@ -28,14 +58,79 @@ class ReagentDataManager:
             The loaded data
         """
         try:
-            with open(self.data_file, "r") as f:
-                self.data = json.load(f)
+            # Read the whole file in one go and parse it from memory
+            with open(self.data_file, "rb", buffering=IO_BUFFER_SIZE) as f:
+                self.data = self._loads(f.read())
         except (FileNotFoundError, json.JSONDecodeError):
             self.data = {"solid reagents": [], "liquid reagents": []}
+        self._last_saved = None
+        self._last_saved_stat = None
+        self._rebuild_index()
         return self.data
 
-    def save_data(self) -> None:
-        """Save reagent data to JSON file."""
+    # Shared with the protocol data manager
+    _loads = staticmethod(JSONUtils.loads)
+    _dumps = staticmethod(JSONUtils.dumps)
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        """Return the data file's (mtime in ns, size), or None if it doesn't exist."""
+        try:
+            st = os.stat(self.data_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the identity index from the current data."""
+        self._index = {
+            id(reagent): key
+            for key in ("solid reagents", "liquid reagents")
+            for reagent in self.data.get(key, [])
+        }
+
+    def _locate(self, reagent: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+        """Return the data key and position of this exact reagent dict, if stored."""
+        key = self._index.get(id(reagent))
+        if key is not None:
+            for i, stored in enumerate(self.data[key]):
+                if stored is reagent:
+                    return key, i
+        return None
+
+    def _replace(self, key: str, i: int, reagent: Dict[str, Any]) -> None:
+        """Replace the reagent at position i of data[key], keeping the index current."""
+        self._index.pop(id(self.data[key][i]), None)
+        self.data[key][i] = reagent
+        self._index[id(reagent)] = key
+
+    def schedule_save(self) -> None:
+        """Save the data after SAVE_DELAY seconds, restarting the wait on each call."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write a scheduled save to disk now, if one is pending."""
+        with self._lock:
+            if self._save_timer is not None:
+                self.save_data()
+
+    @_locked
+    def save_data(self, pretty: bool = False) -> None:
+        """
+        Save reagent data to JSON file, replacing any scheduled save.
+        
+        Parameters:
+        -----------
+        pretty : bool
+            Write indented JSON instead of the compact form
+        """
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+            
         try:
             # Ensure critical keys exist
             if "solid reagents" not in self.data:
@@ -43,13 +138,31 @@ class ReagentDataManager:
             if "liquid reagents" not in self.data:
                 self.data["liquid reagents"] = []
                 
-            with open(self.data_file, "w") as f:
-                json.dump(self.data, f, indent=4)
+            # Serialize up front so the file is written in a single call
+            payload = self._dumps(self.data, pretty)
+            
+            # Nothing to do if the file already holds exactly this content and
+            # hasn't been removed or rewritten by anything else since
+            if payload == self._last_saved and self._file_stat() == self._last_saved_stat:
+                return
+            
+            # Write to a temporary file and swap it in, so a failed write
+            # never leaves a truncated data file behind
+            tmp_file = f"{self.data_file}.tmp"
+            with open(tmp_file, "wb", buffering=IO_BUFFER_SIZE) as f:
+                f.write(payload)
+                # Make sure the data is on disk before anything reads the file back
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            self._last_saved = payload
+            self._last_saved_stat = self._file_stat()
                 
         except Exception as e:
             import traceback
             traceback.print_exc()
             
+    @_locked
     def add_reagent(self, reagent: Dict[str, Any], reagent_type: str) -> None:
         """
         Add a reagent to the data.
@@ -77,14 +190,16 @@ class ReagentDataManager:
         for i, existing in enumerate(self.data[key]):
             if existing.get('name') == reagent.get('name'):
                 # Update instead of add
-                self.data[key][i] = reagent
-                self.save_data()
+                self._replace(key, i, reagent)
+                self.schedule_save()
                 return
                 
         # If not found, add as new
         self.data[key].append(reagent)
-        self.save_data()
+        self._index[id(reagent)] = key
+        self.schedule_save()
         
+    @_locked
     def update_reagent(self, old_reagent: Dict[str, Any], new_reagent: Dict[str, Any], reagent_type: str) -> None:
         """
         Update an existing reagent in the data.
@@ -103,22 +218,29 @@ class ReagentDataManager:
         if key not in self.data:
             self.data[key] = []
             
-        # Find the reagent by name instead of direct object comparison
+        # Find the stored reagent by identity first, then by name
         found = False
         
-        for i, reagent in enumerate(self.data[key]):
-            if reagent.get('name') == old_reagent.get('name'):
-                self.data[key][i] = new_reagent
-                found = True
-                break
+        location = self._locate(old_reagent)
+        if location is not None and location[0] == key:
+            self._replace(key, location[1], new_reagent)
+            found = True
+        else:
+            for i, reagent in enumerate(self.data[key]):
+                if reagent.get('name') == old_reagent.get('name'):
+                    self._replace(key, i, new_reagent)
+                    found = True
+                    break
                 
         if not found:
             # Either it wasn't found or this is a new reagent
             self.data[key].append(new_reagent)
+            self._index[id(new_reagent)] = key
             
         # Always save after updating
-        self.save_data()
+        self.schedule_save()
         
+    @_locked
     def delete_reagent(self, reagent: Dict[str, Any]) -> None:
         """
         Remove a reagent from the data.
@@ -128,11 +250,22 @@ class ReagentDataManager:
         reagent : dict
             Reagent data to remove
         """
-        if reagent in self.data["solid reagents"]:
-            self.data["solid reagents"].remove(reagent)
-        elif reagent in self.data["liquid reagents"]:
-            self.data["liquid reagents"].remove(reagent)
-        self.save_data()
+        location = self._locate(reagent)
+        if location is not None:
+            # Remove by identity rather than by field-by-field equality
+            key, i = location
+            del self.data[key][i]
+            del self._index[id(reagent)]
+        else:
+            # Fall back to an equal reagent, dropping the stored dict's id from
+            # the index so a later dict reusing that id isn't misclassified
+            for key in ("solid reagents", "liquid reagents"):
+                if reagent in self.data[key]:
+                    i = self.data[key].index(reagent)
+                    self._index.pop(id(self.data[key][i]), None)
+                    del self.data[key][i]
+                    break
+        self.schedule_save()
         
     def get_reagent_type(self, reagent: Dict[str, Any]) -> str:
         """
@@ -148,7 +281,12 @@ class ReagentDataManager:
         str
             'solid' or 'liquid'
         """
-        # Check by name first which is more reliable
+        # Stored reagents are answered straight from the identity index
+        key = self._index.get(id(reagent))
+        if key is not None:
+            return "solid" if key == "solid reagents" else "liquid"
+            
+        # Otherwise check by name, which is more reliable than equality
         reagent_name = reagent.get('name', '')
         
         # Check solid reagents
@@ -164,6 +302,7 @@ class ReagentDataManager:
         # Fallback to direct comparison (less reliable)
         return "solid" if reagent in self.data["solid reagents"] else "liquid"
         
+    @_locked
     def update_final_details(self, mass_scale: float, concentration: float, solvent: str) -> None:
         """
         Update the final details in the data.
@@ -193,5 +332,5 @@ class ReagentDataManager:
         """
         return any(
             abs(reagent["eq"] - 1.0) < 1e-6
-            for reagent in self.data["solid reagents"] + self.data["liquid reagents"]
+            for reagent in chain(self.data["solid reagents"], self.data["liquid reagents"])
         )
@@ -1,8 +1,38 @@
 """Form handlers for reagent entry forms."""
+import threading
+from itertools import chain
+
 import ipywidgets as widgets
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple
 from .StructureVisualization import StructureVisualizer
-from mechwolf.DataEntry.ReagentUI.ReagentUtils import validate_reagent_data
+from .UIComponents import UIComponents
+from mechwolf.DataEntry.ReagentUI.ReagentUtils import validate_reagent_data, smiles_looks_plausible
+
+# Seconds the SMILES field must be idle before the structure preview is redrawn
+PREVIEW_DELAY = 0.4
+
+# Shown in place of the structure preview when a SMILES can't be drawn
+_PREVIEW_ERROR_HTML = "<p style='color: #666;'>Could not render structure.<br>Check SMILES format.</p>"
+
+# Layouts shared between forms. Reagent input fields keep their own layouts
+# since their borders are restyled to flag warnings.
+_BUTTON_LAYOUT = UIComponents.mark_shared(widgets.Layout(width="auto"))
+_PREVIEW_BOX_LAYOUT = UIComponents.mark_shared(widgets.Layout(
+    align_items="center",
+    border="1px solid #ddd",
+    margin="10px 0",
+    padding="10px"
+))
+_FINAL_FIELD_LAYOUT = UIComponents.mark_shared(widgets.Layout(width="80%"))
+_FINAL_FORM_LAYOUT = UIComponents.mark_shared(widgets.Layout(
+    border="1px solid #ddd",
+    padding="10px",
+    margin="10px 0"
+))
+
+# Field tooltip markup, normal and flagged
+_TOOLTIP_HTML = "<span style='font-size: 0.8em; color: #666; font-weight: normal;'>{}</span>"
+_ERROR_TOOLTIP_HTML = "<span style='font-size: 0.8em; color: red; font-weight: bold;'>{}</span>"
 
 class ReagentFormHandler:
     """Handler for reagent entry forms."""
@@ -12,10 +42,13 @@ class ReagentFormHandler:
         widget: widgets.Widget, 
         tooltip_text: str, 
         error_style: bool = False
-    ) -> widgets.VBox:
+    ) -> Tuple[widgets.Widget, widgets.HTML]:
         """
         Create a form field with tooltip.
         
+        The input and its tooltip are returned as a pair to be placed directly
+        in the form, rather than wrapped in a box of their own.
+        
         Parameters:
         -----------
         widget : widgets.Widget
@@ -27,29 +60,43 @@ class ReagentFormHandler:
             
         Returns:
         --------
-        widgets.VBox
-            Container with widget and tooltip
+        tuple
+            The input widget and its tooltip
         """
-        tooltip_color = "red" if error_style else "#666"
-        tooltip_weight = "bold" if error_style else "normal"
-        
-        tooltip = widgets.HTML(
-            f"<span style='font-size: 0.8em; color: {tooltip_color}; font-weight: {tooltip_weight};'>{tooltip_text}</span>"
-        )
+        field = (widget, widgets.HTML())
+        ReagentFormHandler.style_form_field(field, tooltip_text, error_style)
+        return field
+    
+    @staticmethod
+    def style_form_field(field: Tuple[widgets.Widget, widgets.HTML], tooltip_text: str, 
+                         error_style: bool = False) -> None:
+        """
+        Update the tooltip and error styling of a field made by create_form_field.
         
-        if error_style:
-            widget.layout.border = "2px solid red"
-            
-        return widgets.VBox([widget, tooltip])
+        Parameters:
+        -----------
+        field : tuple
+            Input and tooltip pair returned by create_form_field
+        tooltip_text : str
+            Text for tooltip
+        error_style : bool
+            Whether to style the tooltip as an error
+        """
+        widget, tooltip = field
+        tooltip.value = (_ERROR_TOOLTIP_HTML if error_style else _TOOLTIP_HTML).format(tooltip_text)
+        widget.layout.border = "2px solid red" if error_style else None
     
     @staticmethod
     def create_reagent_form(reagent_type: str, 
                            reagent: Optional[Dict[str, Any]] = None,
                            on_save: Callable = None,
-                           warning_message: str = None) -> widgets.Widget:
+                           warning_message: str = None) -> "ReagentForm":
         """
         Create a form for adding or editing a reagent.
         
+        The returned form can be reloaded with another reagent through
+        ``ReagentForm.load_reagent`` instead of being rebuilt.
+        
         Parameters:
         -----------
         reagent_type : str
@@ -63,86 +110,63 @@ class ReagentFormHandler:
             
         Returns:
         --------
-        ipywidgets.Widget
+        ReagentForm
             Form widget
         """
         # Set background color based on reagent type
         bg_color = "#F0F7F4" if reagent_type == "solid" else "#EFF7FF"
         
+        # Reagent and save callback the form is currently bound to
+        state = {"reagent": None, "on_save": None}
+        
         # Create form widgets
-        form_title = widgets.HTML(
-            f"<h4 style='color: {'#3F704D' if reagent_type == 'solid' else '#3A5D9F'};'>{'Edit' if reagent else 'Add'} {reagent_type.capitalize()} Reagent</h4>"
-        )
+        form_title = widgets.HTML("")
         
         # Error message area
         error_area = widgets.HTML("")
         
-        # Warning message area (if provided)
+        # Warning message area (filled in by load_reagent when needed)
         warning_area = widgets.HTML("")
-        if warning_message and reagent_type == "liquid":
-            warning_area.value = f"""
-            <div style='color: red; font-weight: bold; background-color: #FFEEEE; 
-                        padding: 8px; margin: 10px 0; border-radius: 4px; 
-                        border: 1px solid #FFD2D2;'>
-              Warning: {warning_message}
-            </div>
-            """
         
         # Create input fields with validation styles
         name_input = widgets.Text(
-            value=reagent["name"] if reagent else "",
             description="Name:",
             layout=widgets.Layout(width="80%")
         )
         
         inchi_input = widgets.Text(
-            value=reagent["inChi"] if reagent else "",
             description="InChi:",
             layout=widgets.Layout(width="80%")
         )
         
         smiles_input = widgets.Text(
-            value=reagent["SMILES"] if reagent else "",
             description="SMILES:",
             layout=widgets.Layout(width="80%")
         )
         
         inchikey_input = widgets.Text(
-            value=reagent["inChi Key"] if reagent else "",
             description="InChi Key:",
             layout=widgets.Layout(width="80%")
         )
         
         mw_input = widgets.FloatText(
-            value=reagent["molecular weight (in g/mol)"] if reagent else 0,
             description="MW (g/mol):",
             layout=widgets.Layout(width="80%")
         )
         
         eq_input = widgets.FloatText(
-            value=reagent["eq"] if reagent else 0,
             description="Equivalents:",
             layout=widgets.Layout(width="80%")
         )
         
         syringe_input = widgets.IntText(
-            value=reagent["syringe"] if reagent else 0,
             description="Syringe:",
             layout=widgets.Layout(width="80%")
         )
         
-        # Create form fields with tooltips using the helper method
-        form_fields = [
-            form_title,
-            error_area
-        ]
-        
-        # Add warning area if there's a warning message
-        if warning_message and reagent_type == "liquid":
-            form_fields.append(warning_area)
-            
-        # Add standard form fields with tooltips
-        form_fields.extend([
+        # Create form fields with tooltips using the helper method, as
+        # (input, tooltip) pairs
+        fields = [
             ReagentFormHandler.create_form_field(
                 name_input, "Required: Chemical name"),
             ReagentFormHandler.create_form_field(
@@ -157,71 +181,144 @@ class ReagentFormHandler:
                 eq_input, "Required: Must be > 0. Set to 1.0 for limiting reagent."),
             ReagentFormHandler.create_form_field(
                 syringe_input, "Required: Must be > 0")
-        ])
+        ]
         
         # Add density field for liquid reagents
+        density_input = None
+        density_field = None
         if reagent_type == "liquid":
             density_input = widgets.FloatText(
-                value=reagent["density (in g/mL)"] if reagent else 0,
                 description="Density (g/mL):",
                 layout=widgets.Layout(width="80%")
             )
             
-            # Add density field with appropriate styling based on warning status
-            density_tooltip = "Required for liquids: Please update this value!" if warning_message else "Required for liquids: Must be > 0"
-            form_fields.append(
-                ReagentFormHandler.create_form_field(
-                    density_input, density_tooltip, error_style=bool(warning_message)
-                )
+            # Tooltip and border are restyled by load_reagent based on warning status
+            density_field = ReagentFormHandler.create_form_field(
+                density_input, "Required for liquids: Must be > 0"
             )
-        
-        # Add structure visualization area
-        structure_area = widgets.Output(
-            layout=widgets.Layout(width="200px", height="200px")
+            fields.append(density_field)
+        
+        # Add structure visualization area; the image and message are updated
+        # in place rather than rebuilt for each preview
+        structure_image = widgets.Image(
+            format="png",
+            width=200,
+            height=200,
+            layout=widgets.Layout(display="none")
         )
+        structure_message = widgets.HTML("")
         
         # Function to update structure visualization
+        # Timer for a redraw that is waiting for typing to pause
+        preview = {"timer": None}
+        preview_lock = threading.Lock()
+        
         def update_structure(change=None):
-            structure_area.clear_output()
-            with structure_area:
-                from IPython.display import display
-                if smiles_input.value:
-                    vis = StructureVisualizer.get_structure_image(smiles_input.value, size=(200, 200))
-                    if vis:
-                        display(vis)
-                    else:
-                        print("Could not render structure.\nCheck SMILES format.")
-                else:
-                    pass  # Empty output
+            with preview_lock:
+                if preview["timer"] is not None:
+                    preview["timer"].cancel()
+                    preview["timer"] = None
+                
+                smiles = smiles_input.value.strip()
+                # Partially typed SMILES are rejected before they reach RDKit
+                png = None
+                if smiles_looks_plausible(smiles):
+                    png = StructureVisualizer.get_structure_png(smiles, (200, 200))
+                
+                if png:
+                    structure_image.value = png
+                structure_image.layout.display = None if png else "none"
+                structure_message.value = _PREVIEW_ERROR_HTML if smiles and not png else ""
+        
+        def schedule_structure_update(change=None):
+            # Each keystroke restarts the wait, so a burst of typing renders once
+            with preview_lock:
+                if preview["timer"] is not None:
+                    preview["timer"].cancel()
+                preview["timer"] = threading.Timer(PREVIEW_DELAY, update_structure)
+                preview["timer"].start()
         
         # Connect update to SMILES field
-        smiles_input.observe(update_structure, names='value')
+        smiles_input.observe(schedule_structure_update, names='value')
         
-        # Add structure visualization
-        form_fields.append(widgets.VBox([
+        # Structure visualization
+        preview_box = widgets.VBox([
             widgets.HTML("<h4>Structure Preview</h4>"),
-            structure_area
-        ], layout=widgets.Layout(
-            align_items="center",
-            border="1px solid #ddd",
-            margin="10px 0",
-            padding="10px"
-        )))
+            structure_image,
+            structure_message
+        ], layout=_PREVIEW_BOX_LAYOUT)
         
         # Create save button
         save_button = widgets.Button(
             description="Save Reagent",
             button_style="success",
-            layout=widgets.Layout(width="auto"),
+            layout=_BUTTON_LAYOUT,
             style={"button_color": "#3F704D" if reagent_type == "solid" else "#3A5D9F"}
         )
         
-        # Just add the save button (removed debug button)
-        form_fields.append(save_button)
+        # Assemble the form in one list, each input followed by its tooltip
+        form_fields = [
+            form_title,
+            error_area,
+            warning_area,
+            *chain.from_iterable(fields),
+            preview_box,
+            save_button
+        ]
+        
+        def load_reagent(new_reagent=None, new_on_save=None, new_warning_message=None,
+                         flag_density=None):
+            """Bind the form to a reagent (or a blank entry) and reset its fields."""
+            # By default a warning refers to the density, the only value imports guess
+            if flag_density is None:
+                flag_density = bool(new_warning_message)
+            
+            state["reagent"] = new_reagent
+            state["on_save"] = new_on_save
+            
+            form_title.value = (
+                f"<h4 style='color: {'#3F704D' if reagent_type == 'solid' else '#3A5D9F'};'>"
+                f"{'Edit' if new_reagent else 'Add'} {reagent_type.capitalize()} Reagent</h4>"
+            )
+            error_area.value = ""
+            
+            if new_warning_message:
+                warning_area.value = f"""
+                <div style='color: red; font-weight: bold; background-color: #FFEEEE; 
+                            padding: 8px; margin: 10px 0; border-radius: 4px; 
+                            border: 1px solid #FFD2D2;'>
+                  Warning: {new_warning_message}
+                </div>
+                """
+            else:
+                warning_area.value = ""
+            
+            name_input.value = new_reagent["name"] if new_reagent else ""
+            inchi_input.value = new_reagent["inChi"] if new_reagent else ""
+            inchikey_input.value = new_reagent["inChi Key"] if new_reagent else ""
+            mw_input.value = new_reagent["molecular weight (in g/mol)"] if new_reagent else 0
+            eq_input.value = new_reagent["eq"] if new_reagent else 0
+            syringe_input.value = new_reagent["syringe"] if new_reagent else 0
+            
+            if density_input is not None:
+                density_input.value = new_reagent["density (in g/mL)"] if new_reagent else 0
+                
+                # Style the density field based on warning status
+                ReagentFormHandler.style_form_field(
+                    density_field,
+                    "Required for liquids: Please update this value!" if flag_density
+                    else "Required for liquids: Must be > 0",
+                    error_style=flag_density
+                )
+            
+            # A loaded reagent's structure is drawn straight away, not after the typing delay
+            smiles_input.value = new_reagent["SMILES"] if new_reagent else ""
+            update_structure()
         
         # Create form container with color coding
-        form = widgets.VBox(
+        form = ReagentForm(
             form_fields,
+            load_reagent=load_reagent,
             layout=widgets.Layout(
                 border=f"1px solid {'#90BE6D' if reagent_type == 'solid' else '#577590'}",
                 padding="15px",
@@ -230,82 +327,106 @@ class ReagentFormHandler:
             )
         )
         
-        # Update structure if SMILES is available
-        if smiles_input.value:
-            update_structure()
+        # Fill in the initial values
+        load_reagent(reagent, on_save, warning_message)
         
         # Set up callback for save button
-        if on_save:
-            def validate_and_save(b):
-                # Collect form data
-                # Clean the InChI value by removing the InChI= prefix if present
-                inchi_value = inchi_input.value
-                if inchi_value and inchi_value.startswith("InChI="):
-                    inchi_value = inchi_value[6:]  # Remove 'InChI=' prefix
-                
-                new_reagent = {
-                    "name": name_input.value,
-                    "inChi": inchi_value,  # Use the cleaned InChI value
-                    "SMILES": smiles_input.value,
-                    "inChi Key": inchikey_input.value,
-                    "molecular weight (in g/mol)": mw_input.value,
-                    "eq": eq_input.value,
-                    "syringe": syringe_input.value
-                }
-                
-                # Add density for liquid reagents
-                if reagent_type == "liquid" and 'density_input' in locals():
-                    new_reagent["density (in g/mL)"] = density_input.value
-                
-                # Validate data
-                validation_errors = validate_reagent_data(new_reagent, reagent_type)
-                
-                # Reset error displays
+        def validate_and_save(b):
+            reagent = state["reagent"]
+            on_save = state["on_save"]
+            if not on_save:
+                return
+            
+            # Collect form data
+            # Clean the InChI value by removing the InChI= prefix if present
+            inchi_value = inchi_input.value
+            if inchi_value and inchi_value.startswith("InChI="):
+                inchi_value = inchi_value[6:]  # Remove 'InChI=' prefix
+            
+            new_reagent = {
+                "name": name_input.value,
+                "inChi": inchi_value,  # Use the cleaned InChI value
+                "SMILES": smiles_input.value,
+                "inChi Key": inchikey_input.value,
+                "molecular weight (in g/mol)": mw_input.value,
+                "eq": eq_input.value,
+                "syringe": syringe_input.value
+            }
+            
+            # Add density for liquid reagents
+            if density_input is not None:
+                new_reagent["density (in g/mL)"] = density_input.value
+            
+            # Validate data
+            validation_errors = validate_reagent_data(new_reagent, reagent_type)
+            
+            # Reset error displays
+            error_area.value = ""
+            
+            # If errors, show them
+            if validation_errors:
+                parts = [
+                    "<div style='color: red; padding: 10px; background-color: #FFEEEE; border-radius: 5px; margin-bottom: 10px;'>",
+                    "<b>Please correct the following errors:</b><ul>"
+                ]
+                parts.extend(f"<li>{message}</li>" for message in validation_errors.values())
+                parts.append("</ul></div>")
+                error_area.value = "".join(parts)
+                return
+            
+            try:
+                # Clear any existing error message
                 error_area.value = ""
                 
-                # If errors, show them
-                if validation_errors:
-                    error_html = "<div style='color: red; padding: 10px; background-color: #FFEEEE; border-radius: 5px; margin-bottom: 10px;'>"
-                    error_html += "<b>Please correct the following errors:</b><ul>"
-                    for field, message in validation_errors.items():
-                        error_html += f"<li>{message}</li>"
-                    error_html += "</ul></div>"
-                    error_area.value = error_html
-                    return
+                # Call the save callback with the new reagent and old reagent (if editing)
+                success = on_save(new_reagent, reagent)
                 
-                try:
-                    # Clear any existing error message
-                    error_area.value = ""
-                    
-                    # Call the save callback with the new reagent and old reagent (if editing)
-                    success = on_save(new_reagent, reagent)
+                if success:
+                    # Avoid clearing the form when editing (only clear for new entries)
+                    if not reagent:  # Only clear if this is a new entry (not editing)
+                        load_reagent(None, on_save)
                     
-                    if success:
-                        # Show success message
-                        error_area.value = "<div style='color: green; padding: 10px; background-color: #EEFFEE; border-radius: 5px; margin-bottom: 10px;'><b>Reagent saved successfully!</b></div>"
-                        
-                        # Avoid clearing the form when editing (only clear for new entries)
-                        if not reagent:  # Only clear if this is a new entry (not editing)
-                            name_input.value = ""
-                            inchi_input.value = ""
-                            smiles_input.value = ""
-                            inchikey_input.value = ""
-                            mw_input.value = 0
-                            eq_input.value = 0
-                            syringe_input.value = 0
-                            if reagent_type == "liquid" and 'density_input' in locals():
-                                density_input.value = 0
-                    else:
-                        error_area.value = "<div style='color: red; padding: 10px; background-color: #FFEEEE; border-radius: 5px; margin-bottom: 10px;'><b>Failed to save reagent. Check console for errors.</b></div>"
-                except Exception as e:
-                    error_area.value = f"<div style='color: red; padding: 10px; background-color: #FFEEEE; border-radius: 5px; margin-bottom: 10px;'><b>Error: {str(e)}</b></div>"
-                    import traceback
-                    traceback.print_exc()
-            
-            save_button.on_click(validate_and_save)
+                    # Show success message
+                    error_area.value = "<div style='color: green; padding: 10px; background-color: #EEFFEE; border-radius: 5px; margin-bottom: 10px;'><b>Reagent saved successfully!</b></div>"
+                else:
+                    error_area.value = "<div style='color: red; padding: 10px; background-color: #FFEEEE; border-radius: 5px; margin-bottom: 10px;'><b>Failed to save reagent. Check console for errors.</b></div>"
+            except Exception as e:
+                error_area.value = f"<div style='color: red; padding: 10px; background-color: #FFEEEE; border-radius: 5px; margin-bottom: 10px;'><b>Error: {str(e)}</b></div>"
+                import traceback
+                traceback.print_exc()
+        
+        save_button.on_click(validate_and_save)
         
         return form
 
+class ReagentForm(widgets.VBox):
+    """Reagent entry form that can be reloaded instead of rebuilt."""
+    
+    def __init__(self, children, load_reagent: Callable, **kwargs):
+        super().__init__(children, **kwargs)
+        self._load_reagent = load_reagent
+        
+    def load_reagent(self, reagent: Optional[Dict[str, Any]] = None,
+                     on_save: Callable = None,
+                     warning_message: str = None,
+                     flag_density: Optional[bool] = None) -> None:
+        """
+        Reset the form fields for a new reagent entry or an edit.
+        
+        Parameters:
+        -----------
+        reagent : dict, optional
+            Reagent data to edit, or None for a blank entry
+        on_save : callable
+            Callback for save button
+        warning_message : str, optional
+            Warning message to display in the form
+        flag_density : bool, optional
+            Whether to flag the density field for review. Defaults to
+            flagging it whenever there is a warning message.
+        """
+        self._load_reagent(reagent, on_save, warning_message, flag_density)
+
 class FinalDetailsFormHandler:
     """Handler for final details form."""
     
@@ -341,7 +462,7 @@ class FinalDetailsFormHandler:
         limiting_reagent = None
         limiting_reagent_mw = None
         
-        for reagent in data.get("solid reagents", []) + data.get("liquid reagents", []):
+        for reagent in chain(data.get("solid reagents", []), data.get("liquid reagents", [])):
             if abs(reagent.get("eq", 0) - 1.0) < 1e-6:
                 limiting_reagent = reagent["name"]
                 limiting_reagent_mw = reagent["molecular weight (in g/mol)"]
@@ -358,13 +479,13 @@ class FinalDetailsFormHandler:
         mass_scale_input = widgets.FloatText(
             value=mass_scale_value,
             description="Mass scale (mg):",
-            layout=widgets.Layout(width="80%")
+            layout=_FINAL_FIELD_LAYOUT
         )
         
         concentration_input = widgets.FloatText(
             value=concentration_value,
             description="Concentration (mM):",
-            layout=widgets.Layout(width="80%")
+            layout=_FINAL_FIELD_LAYOUT
         )
         
         # Add display for calculated volume
@@ -399,13 +520,13 @@ class FinalDetailsFormHandler:
         solvent_input = widgets.Text(
             value=solvent_value,
             description="Solvents:",
-            layout=widgets.Layout(width="80%")
+            layout=_FINAL_FIELD_LAYOUT
         )
         
         submit_button = widgets.Button(
             description="Process Data",
             button_style="success",
-            layout=widgets.Layout(width="auto")
+            layout=_BUTTON_LAYOUT
         )
         
         # Create form container
@@ -420,11 +541,7 @@ class FinalDetailsFormHandler:
                 solvent_input,
                 submit_button
             ],
-            layout=widgets.Layout(
-                border="1px solid #ddd",
-                padding="10px",
-                margin="10px 0"
-            )
+            layout=_FINAL_FORM_LAYOUT
         )
         
         # Set up button callback
@@ -11,12 +11,14 @@ Classes:
     Solid: Inherits from Reagent and represents a solid reagent.
     Liquid: Inherits from Reagent and represents a liquid reagent with additional attributes for density and volume.
 Functions:
-    process_data(data_file: str) -> None: Processes the reagent data, calculates moles and mass, and generates a stoichiometry table.
+    process_data(data_file: str, data: Optional[dict] = None) -> None: Processes the reagent data (read from data_file unless already loaded data is passed), calculates moles and mass, and generates a stoichiometry table.
     main() -> None: Placeholder function for script entry point.
 Example:
     To use this script, call the `process_data` function with the path to the JSON file containing reagent data:
     process_data("path/to/data_file.json")
 """
+from itertools import chain
+
 from astropy.table import QTable
 from sigfig import round
 from typing import Dict, Any, Optional, List
@@ -75,14 +77,16 @@ class Liquid(Reagent):
         )
 
 
-def process_data(data_file: str) -> None:
-    with open(data_file, "r") as f:
-        data: Dict[str, Any] = json.load(f)
+def process_data(data_file: str, data: Optional[Dict[str, Any]] = None) -> None:
+    # Callers that already hold the parsed data can pass it to skip re-reading the file
+    if data is None:
+        with open(data_file, "r") as f:
+            data = json.load(f)
 
     limiting_reagent: Optional[str] = None
     mw_limiting: Optional[float] = None
 
-    for reagent in data["solid reagents"] + data["liquid reagents"]:
+    for reagent in chain(data["solid reagents"], data["liquid reagents"]):
         if reagent["eq"] == 1:
             limiting_reagent = reagent["name"]
             mw_limiting = reagent["molecular weight (in g/mol)"]
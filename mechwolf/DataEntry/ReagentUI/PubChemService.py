@@ -1,14 +1,149 @@
 """PubChem API service for chemical data retrieval."""
-import requests
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
 from typing import Dict, Any, List, Optional
-from mechwolf.DataEntry.ReagentUI.ReagentUtils import validate_smiles, suppress_stderr, safe_mol_from_smiles
+from mechwolf.DataEntry.ReagentUI.ReagentUtils import validate_smiles
+
+# Number of searches kept in the cache before the least recently used is dropped
+CACHE_SIZE = 256
+
+# Seconds a cached search stays valid, so stale PubChem data is eventually refreshed
+CACHE_TTL = 30 * 24 * 60 * 60
+
+# Connect and read timeouts, in seconds, for PubChem requests
+REQUEST_TIMEOUT = (3, 10)
+
+# PubChem input namespaces for each search type
+_PUBCHEM_INPUT_TYPES = {
+    'name': 'name',
+    'smiles': 'smiles',
+    'inchi': 'inchi',
+    'inchi key': 'inchikey',
+    'cas': 'xref/RN'
+}
+
+# Input types always sent as a POST body rather than in the URL
+_POST_INPUT_TYPES = ('smiles', 'inchi')
+
+# Longest encoded query sent in the URL; longer ones are POSTed instead
+MAX_URL_QUERY = 300
+
+# Identifier types that PubChem matches regardless of case (SMILES and InChI are case-sensitive)
+_CASE_INSENSITIVE_TYPES = ('name', 'cas', 'inchi key')
 
 class PubChemService:
     """Service for interacting with the PubChem API."""
     
-    def __init__(self):
-        """Initialize the service with an empty cache."""
-        self.cache = {}
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        Initialize the service, loading previous searches from cache_file.
+        
+        Parameters:
+        -----------
+        cache_file : str, optional
+            JSON file that keeps search results across sessions. Without it
+            results are only cached in memory.
+        """
+        self.cache = OrderedDict()
+        self.cache_file = cache_file
+        # Searches may run on background threads, so guard the cache
+        self._cache_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._load_cache()
+        # HTTP session, created on first lookup so the form loads without requests
+        self._http = None
+        self._http_lock = threading.Lock()
+        
+    def _load_cache(self) -> None:
+        """Fill the cache from cache_file, skipping expired entries."""
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(stored, dict):
+            return
+        now = time.time()
+        # Oldest entries first, so the newest are least recently used last
+        entries = sorted(
+            (entry["ts"], key, entry["results"])
+            for key, entry in stored.items()
+            if isinstance(entry, dict) and "ts" in entry and "results" in entry
+        )
+        for ts, key, results in entries[-CACHE_SIZE:]:
+            if now - ts < CACHE_TTL:
+                self.cache[key] = {"ts": ts, "results": results}
+                
+    def _flush_cache(self) -> None:
+        """Write the cache to cache_file, replacing the old file in one step."""
+        if not self.cache_file:
+            return
+        with self._cache_lock:
+            payload = json.dumps(self.cache, separators=(",", ":"))
+        with self._file_lock:
+            tmp_file = f"{self.cache_file}.tmp"
+            try:
+                with open(tmp_file, "w") as f:
+                    f.write(payload)
+                os.replace(tmp_file, self.cache_file)
+            except OSError:
+                # The cache is only an optimization; searches still work without it
+                pass
+        
+    def _session(self):
+        """
+        Return the shared HTTP session, creating it on first use.
+        
+        Reusing one session keeps the connection to PubChem open between
+        requests, so a search does not pay a TLS handshake per call.
+        Transient gateway errors are retried with a short backoff.
+        
+        Returns:
+        --------
+        requests.Session
+            Session used for all PubChem requests
+        """
+        with self._http_lock:
+            if self._http is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=8,
+                    # PubChem lookups don't change anything, so POSTed ones are safe to retry too
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=[502, 503, 504],
+                        allowed_methods=frozenset(["GET", "POST"])
+                    )
+                )
+                session.mount("https://", adapter)
+                self._http = session
+            return self._http
+            
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+        
+    @staticmethod
+    def _cache_key(query: str, search_type: str) -> str:
+        """Normalize a query so equivalent searches share a cache entry."""
+        if search_type in _CASE_INSENSITIVE_TYPES:
+            query = query.lower()
+        return f"{search_type}:{query}"
         
     def search(self, query: str, search_type: str) -> List[Dict[str, Any]]:
         """
@@ -28,34 +163,36 @@ class PubChemService:
         """
         base_url = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
         
+        query = query.strip()
+        
         # Check if result is in cache
-        cache_key = f"{search_type}:{query}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cache_key = self._cache_key(query, search_type)
+        with self._cache_lock:
+            entry = self.cache.get(cache_key)
+            if entry is not None and time.time() - entry["ts"] < CACHE_TTL:
+                self.cache.move_to_end(cache_key)
+                return list(entry["results"])
         
         try:
+            # The session imports requests, so the form loads without it until a lookup is made
+            http = self._session()
+            
             # Validate input before sending to PubChem
             if search_type == 'smiles' and not validate_smiles(query):
                 return []
             
-            # Map search type to PubChem's input types
-            input_type = {
-                'name': 'name',
-                'smiles': 'smiles',
-                'inchi': 'inchi',
-                'inchi key': 'inchikey',
-                'cas': 'cas'  # Change this to a simple identifier
-            }.get(search_type, 'name')
-            
-            # Different endpoint based on search type
-            if input_type == 'cas':
-                # Special handling for CAS Registry Numbers
-                url = f"{base_url}/compound/xref/RN/{query}/cids/JSON"
-            else:
-                url = f"{base_url}/compound/{input_type}/{query}/cids/JSON"
+            input_type = _PUBCHEM_INPUT_TYPES.get(search_type, 'name')
             
-            # Get compound IDs with timeout and error handling
-            response = requests.get(url, timeout=10)
+            # SMILES and InChIs can contain '/' and '\\', which PubChem doesn't
+            # accept in the URL path even when encoded, so they go in a POST
+            # body, as do very long queries; the rest are encoded into the URL
+            quoted = quote(query, safe='')
+            if input_type in _POST_INPUT_TYPES or (input_type != 'xref/RN' and len(quoted) > MAX_URL_QUERY):
+                url = f"{base_url}/compound/{input_type}/cids/JSON"
+                response = http.post(url, data={input_type: query}, timeout=REQUEST_TIMEOUT)
+            else:
+                url = f"{base_url}/compound/{input_type}/{quoted}/cids/JSON"
+                response = http.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             data = response.json()
@@ -64,23 +201,15 @@ class PubChemService:
                 
             cids = data['IdentifierList']['CID'][:5]  # Limit to first 5 results
             
-            # Get compound data for each CID
+            # Get properties for all CIDs in a single request
+            cid_list = ",".join(str(cid) for cid in cids)
+            prop_url = f"{base_url}/compound/cid/{cid_list}/property/IUPACName,MolecularFormula,MolecularWeight,InChI,InChIKey,CanonicalSMILES/JSON"
+            prop_response = http.get(prop_url, timeout=REQUEST_TIMEOUT)
+            prop_response.raise_for_status()
+            
             results = []
-            for cid in cids:
-                # Get properties
-                prop_url = f"{base_url}/compound/cid/{cid}/property/IUPACName,MolecularFormula,MolecularWeight,InChI,InChIKey,CanonicalSMILES/JSON"
-                prop_response = requests.get(prop_url, timeout=10)
-                prop_response.raise_for_status()
-                
-                props = prop_response.json()['PropertyTable']['Properties'][0]
-                
-                # Validate SMILES before including in result
-                smiles = props.get('CanonicalSMILES', '')
-                
-                # Use safe mol creation that doesn't print errors
-                with suppress_stderr():
-                    if not safe_mol_from_smiles(smiles):
-                        smiles = ''  # Invalid SMILES, clear it
+            for props in prop_response.json()['PropertyTable']['Properties']:
+                cid = props.get('CID')
                 
                 # Create result object
                 compound = {
@@ -90,21 +219,24 @@ class PubChemService:
                     'molecular_weight': float(props.get('MolecularWeight', 0)),
                     'inchi': props.get('InChI', ''),
                     'inchikey': props.get('InChIKey', ''),
-                    'smiles': smiles,
+                    'smiles': props.get('CanonicalSMILES', ''),
                     'density': self.get_density(cid)  # Get density for the compound
                 }
                 
                 results.append(compound)
             
-            # Cache results
-            self.cache[cache_key] = results
-            return results
+            # Cache results, dropping the least recently used search if full
+            with self._cache_lock:
+                self.cache[cache_key] = {"ts": time.time(), "results": results}
+                self.cache.move_to_end(cache_key)
+                if len(self.cache) > CACHE_SIZE:
+                    self.cache.popitem(last=False)
+            self._flush_cache()
+            return list(results)
             
-        except requests.exceptions.Timeout:
-            return []
-        except requests.exceptions.RequestException as e:
-            return []
-        except Exception as e:
+        except Exception:
+            # Timeouts, request errors, a missing requests package and
+            # unexpected responses all mean no results
             return []
             
     def get_density(self, cid: str) -> Optional[float]:
@@ -126,7 +258,7 @@ class PubChemService:
             base_url = "https://pubchem.ncbi.nlm.nih.gov/rest/pug_view"
             url = f"{base_url}/data/compound/{cid}/JSON"
             
-            response = requests.get(url, timeout=10)
+            response = self._session().get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             data = response.json()
@@ -1,6 +1,7 @@
 """Utility functions for MechWolf DataEntry module."""
 import sys
 import os
+import re
 from contextlib import contextmanager
 
 # Context manager to suppress stderr
@@ -14,6 +15,58 @@ def suppress_stderr():
         sys.stderr.close()
         sys.stderr = old_stderr
 
+
+# Characters that can appear in a SMILES string
+_SMILES_CHARS = re.compile(r'^[A-Za-z0-9@+\-=#$:/\\.\[\]()%*]+$')
+
+# Characters a complete SMILES string can't end on
+_SMILES_OPEN_ENDS = frozenset("=#$(-/\\.:")
+
+
+def smiles_looks_plausible(smiles_string):
+    """
+    Cheaply check that a string could be a complete SMILES before parsing it.
+    
+    Rejects strings with characters outside the SMILES alphabet, unbalanced
+    parentheses or brackets, or a trailing bond or open branch, which is what
+    most partially typed SMILES look like. Passing this check does not mean
+    the SMILES is valid.
+    
+    Parameters:
+    -----------
+    smiles_string : str
+        The SMILES string to check
+        
+    Returns:
+    --------
+    bool
+        False if the string certainly isn't a complete SMILES, True otherwise
+    """
+    if not smiles_string or not _SMILES_CHARS.match(smiles_string):
+        return False
+    if smiles_string[-1] in _SMILES_OPEN_ENDS:
+        return False
+    
+    # Branches must balance, and atoms in brackets can't be nested
+    depth = 0
+    in_bracket = False
+    for char in smiles_string:
+        if char == '[':
+            if in_bracket:
+                return False
+            in_bracket = True
+        elif char == ']':
+            if not in_bracket:
+                return False
+            in_bracket = False
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0 and not in_bracket
+
 def validate_smiles(smiles_string):
     """
     Validate a SMILES string with basic checks.
@@ -116,6 +169,10 @@ def safe_mol_from_smiles(smiles):
     """
     Create a molecule from SMILES with error suppression.
     
+    This is preview-grade parsing: chirality cleanup is skipped during
+    sanitization, since drawing and validity checks don't need it. Code that
+    relies on stereochemistry should sanitize the molecule fully.
+    
     Parameters:
     -----------
     smiles : str
@@ -124,7 +181,7 @@ def safe_mol_from_smiles(smiles):
     Returns:
     --------
     RDKit.Chem.Mol or None
-        Molecule object if successful, None otherwise
+        Molecule object if it parses and sanitizes, None otherwise
     """
     try:
         from rdkit import Chem
@@ -136,9 +193,13 @@ def safe_mol_from_smiles(smiles):
             mol = Chem.MolFromSmiles(smiles, sanitize=False)
             if mol is not None:
                 try:
-                    Chem.SanitizeMol(mol)
-                except:
-                    pass
+                    # Valences are still checked; a molecule that fails them is rejected
+                    Chem.SanitizeMol(
+                        mol,
+                        sanitizeOps=Chem.SanitizeFlags.SANITIZE_ALL ^ Chem.SanitizeFlags.SANITIZE_CLEANUPCHIRALITY
+                    )
+                except Exception:
+                    return None
             return mol
     except ImportError:
         return None
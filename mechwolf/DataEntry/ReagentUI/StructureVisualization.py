@@ -1,9 +1,13 @@
 """Structure visualization utilities for chemical structures."""
 import io
+from functools import lru_cache
 from typing import Optional, Tuple, Any
 from mechwolf.DataEntry.ReagentUI.ReagentUtils import is_rdkit_available, safe_mol_from_smiles
 import ipywidgets as widgets
 
+# Number of rendered structures kept, so a SMILES shown again skips the parse and draw
+RENDER_CACHE_SIZE = 128
+
 class StructureVisualizer:
     """Visualizes chemical structures using RDKit."""
     
@@ -39,9 +43,10 @@ class StructureVisualizer:
             return None
     
     @staticmethod
-    def get_structure_image(smiles: str, size: Tuple[int, int] = (150, 150)) -> Optional[widgets.Image]:
+    @lru_cache(maxsize=RENDER_CACHE_SIZE)
+    def get_structure_png(smiles: str, size: Tuple[int, int]) -> Optional[bytes]:
         """
-        Create an image widget from SMILES.
+        Render a molecule to PNG bytes, caching the result per SMILES and size.
         
         Parameters:
         -----------
@@ -52,20 +57,61 @@ class StructureVisualizer:
             
         Returns:
         --------
-        ipywidgets.Image or None
-            Image widget if successful, None otherwise
+        bytes or None
+            PNG data if successful, None otherwise
         """
+        if not is_rdkit_available() or not smiles:
+            return None
+            
+        # Draw straight to PNG with the Cairo backend when RDKit was built with it
+        try:
+            from rdkit.Chem.Draw import rdMolDraw2D
+            
+            mol = safe_mol_from_smiles(smiles)
+            if not mol:
+                return None
+                
+            drawer = rdMolDraw2D.MolDraw2DCairo(*size)
+            drawer.DrawMolecule(mol)
+            drawer.FinishDrawing()
+            return drawer.GetDrawingText()
+        except (ImportError, AttributeError):
+            pass
+        except Exception:
+            return None
+            
+        # Otherwise go through a PIL image
         img = StructureVisualizer._render_structure(smiles, size)
         if img is None:
             return None
             
-        # Convert PIL image to widget
         buffer = io.BytesIO()
         img.save(buffer, format='PNG')
-        buffer.seek(0)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def get_structure_image(smiles: str, size: Tuple[int, int] = (150, 150)) -> Optional[widgets.Image]:
+        """
+        Create an image widget from SMILES.
         
+        Parameters:
+        -----------
+        smiles : str
+            SMILES string
+        size : tuple
+            Image size as (width, height)
+            
+        Returns:
+        --------
+        ipywidgets.Image or None
+            Image widget if successful, None otherwise
+        """
+        png = StructureVisualizer.get_structure_png(smiles, tuple(size))
+        if png is None:
+            return None
+            
         return widgets.Image(
-            value=buffer.getvalue(),
+            value=png,
             format='png',
             width=size[0],
             height=size[1]
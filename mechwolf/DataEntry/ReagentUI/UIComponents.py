@@ -1,11 +1,107 @@
 """UI components for reagent entry forms."""
+from functools import partial
+
 import ipywidgets as widgets
 from typing import Dict, Any, Callable
 from .StructureVisualization import StructureVisualizer
 
+# Layouts and button styles shared by every reagent row and search result, so
+# the frontend holds one model for each instead of one per widget
+_EDIT_BUTTON_LAYOUT = widgets.Layout(width="60px")
+_DELETE_BUTTON_LAYOUT = widgets.Layout(width="70px")
+_EDIT_BUTTON_STYLE = widgets.ButtonStyle(button_color="#1E3A8A")
+_DELETE_BUTTON_STYLE = widgets.ButtonStyle(button_color="#D72638")
+_ITEM_BUTTONS_LAYOUT = widgets.Layout(margin="0 0 0 10px", align_items="flex-start")
+_ITEM_LAYOUTS = {
+    is_solid: widgets.Layout(
+        margin="2px 0",
+        align_items="center",
+        border=f"1px solid {'#90BE6D' if is_solid else '#577590'}",
+        border_radius="5px",
+        padding="5px"
+    )
+    for is_solid in (True, False)
+}
+_IMPORT_SOLID_STYLE = widgets.ButtonStyle(button_color="#3F704D")
+_IMPORT_LIQUID_STYLE = widgets.ButtonStyle(button_color="#3A5D9F")
+_SEARCH_RESULT_LAYOUT = widgets.Layout(margin="5px 0")
+_SHARED_MODELS = {
+    id(model) for model in (
+        _EDIT_BUTTON_LAYOUT, _DELETE_BUTTON_LAYOUT, _EDIT_BUTTON_STYLE,
+        _DELETE_BUTTON_STYLE, _ITEM_BUTTONS_LAYOUT, *_ITEM_LAYOUTS.values(),
+        _IMPORT_SOLID_STYLE, _IMPORT_LIQUID_STYLE, _SEARCH_RESULT_LAYOUT
+    )
+}
+
+# Markup for a reagent row; liquids also show their density
+_ITEM_HTML = """
+        <div style="padding: 8px; background-color: {{bg}}; border-radius: 4px; margin-bottom: 4px;">
+            <h4 style="margin: 0 0 5px 0;">{{name}}</h4>
+            <div style="display: flex; flex-direction: row;">
+                <div style="flex: 1;">
+                    <p style="margin: 2px 0;"><b>Eq:</b> {{eq}}</p>
+                    <p style="margin: 2px 0;"><b>MW:</b> {{mw}} g/mol</p>
+                </div>
+                <div style="flex: 1;">
+                    <p style="margin: 2px 0;"><b>Syringe:</b> {{syringe}}</p>
+                    {density_line}
+                </div>
+            </div>
+        </div>
+        """
+_ITEM_SOLID_TEMPLATE = _ITEM_HTML.format(density_line="")
+_ITEM_LIQUID_TEMPLATE = _ITEM_HTML.format(
+    density_line='<p style="margin: 2px 0;"><b>Density:</b> {density} g/mL</p>'
+)
+
+def _click_handler(callback: Callable, item: Dict[str, Any], button: widgets.Button) -> None:
+    """Button click handler that passes the bound item to callback."""
+    callback(item)
+
 class UIComponents:
     """Factory for creating UI components."""
     
+    @staticmethod
+    def mark_shared(model: widgets.Widget) -> widgets.Widget:
+        """
+        Register a layout or style that is shared between widgets.
+        
+        Parameters:
+        -----------
+        model : ipywidgets.Widget
+            Layout or style instance reused by several widgets
+            
+        Returns:
+        --------
+        ipywidgets.Widget
+            The same model, so it can be used inline in an assignment
+        """
+        _SHARED_MODELS.add(id(model))
+        return model
+    
+    @staticmethod
+    def close_widget(widget: widgets.Widget) -> None:
+        """
+        Close a widget and all of its descendants.
+        
+        Widget.close() only tears down the widget itself, so a discarded box
+        would otherwise leave its children's models alive in the kernel and
+        frontend. Each widget's layout and style are closed too, except for
+        the ones registered with mark_shared.
+        
+        Parameters:
+        -----------
+        widget : ipywidgets.Widget
+            Widget to close
+        """
+        for child in getattr(widget, "children", ()):
+            UIComponents.close_widget(child)
+        for attr in ("layout", "style"):
+            model = getattr(widget, attr, None)
+            if isinstance(model, widgets.Widget) and id(model) not in _SHARED_MODELS:
+                model.close()
+        widget.close()
+    
     @staticmethod
     def create_reagent_item(reagent: Dict[str, Any], is_solid: bool, 
                             on_edit: Callable, on_delete: Callable) -> widgets.Widget:
@@ -36,22 +132,16 @@ class UIComponents:
             size=(120, 120)
         )
         
-        # Style for reagent item
-        item_style = f"""
-        <div style="padding: 8px; background-color: {bg_color}; border-radius: 4px; margin-bottom: 4px;">
-            <h4 style="margin: 0 0 5px 0;">{reagent['name']}</h4>
-            <div style="display: flex; flex-direction: row;">
-                <div style="flex: 1;">
-                    <p style="margin: 2px 0;"><b>Eq:</b> {reagent['eq']}</p>
-                    <p style="margin: 2px 0;"><b>MW:</b> {reagent['molecular weight (in g/mol)']} g/mol</p>
-                </div>
-                <div style="flex: 1;">
-                    <p style="margin: 2px 0;"><b>Syringe:</b> {reagent['syringe']}</p>
-                    {f'<p style="margin: 2px 0;"><b>Density:</b> {reagent.get("density (in g/mL)", "N/A")} g/mL</p>' if not is_solid else ''}
-                </div>
-            </div>
-        </div>
-        """
+        # Fill in the markup for this reagent's state
+        template = _ITEM_SOLID_TEMPLATE if is_solid else _ITEM_LIQUID_TEMPLATE
+        item_style = template.format(
+            bg=bg_color,
+            name=reagent['name'],
+            eq=reagent['eq'],
+            mw=reagent['molecular weight (in g/mol)'],
+            syringe=reagent['syringe'],
+            density=reagent.get("density (in g/mL)", "N/A")
+        )
         
         # HTML widget for the reagent details
         html_widget = widgets.HTML(item_style)
@@ -60,50 +150,32 @@ class UIComponents:
         edit_button = widgets.Button(
             description="Edit",
             button_style="info",
-            layout=widgets.Layout(width="60px"),
-            style={"button_color": "#1E3A8A"}
+            layout=_EDIT_BUTTON_LAYOUT,
+            style=_EDIT_BUTTON_STYLE
         )
         
         delete_button = widgets.Button(
             description="Delete",
             button_style="danger",
-            layout=widgets.Layout(width="70px"),
-            style={"button_color": "#D72638"}
+            layout=_DELETE_BUTTON_LAYOUT,
+            style=_DELETE_BUTTON_STYLE
         )
         
         # Setup callbacks
-        edit_button.on_click(lambda b: on_edit(reagent))
-        delete_button.on_click(lambda b: on_delete(reagent))
+        edit_button.on_click(partial(_click_handler, on_edit, reagent))
+        delete_button.on_click(partial(_click_handler, on_delete, reagent))
         
         # Container for buttons
         button_container = widgets.VBox(
             [edit_button, delete_button],
-            layout=widgets.Layout(margin="0 0 0 10px", align_items="flex-start")
+            layout=_ITEM_BUTTONS_LAYOUT
         )
         
-        # Return an HBox containing the structure, HTML and buttons
+        # Return an HBox containing the structure (if any), HTML and buttons
+        children = [html_widget, button_container]
         if structure_widget:
-            return widgets.HBox(
-                [structure_widget, html_widget, button_container],
-                layout=widgets.Layout(
-                    margin="2px 0",
-                    align_items="center",
-                    border=f"1px solid {'#90BE6D' if is_solid else '#577590'}",
-                    border_radius="5px",
-                    padding="5px"
-                )
-            )
-        else:
-            return widgets.HBox(
-                [html_widget, button_container],
-                layout=widgets.Layout(
-                    margin="2px 0",
-                    align_items="center",
-                    border=f"1px solid {'#90BE6D' if is_solid else '#577590'}",
-                    border_radius="5px",
-                    padding="5px"
-                )
-            )
+            children.insert(0, structure_widget)
+        return widgets.HBox(children, layout=_ITEM_LAYOUTS[bool(is_solid)])
     
     @staticmethod
     def create_search_result_widget(compound: Dict[str, Any], 
@@ -149,18 +221,18 @@ class UIComponents:
         import_solid_button = widgets.Button(
             description="Import as Solid",
             button_style="success",
-            style={"button_color": "#3F704D"}
+            style=_IMPORT_SOLID_STYLE
         )
         
         import_liquid_button = widgets.Button(
             description="Import as Liquid",
             button_style="info",
-            style={"button_color": "#3A5D9F"}
+            style=_IMPORT_LIQUID_STYLE
         )
         
         # Set up callbacks
-        import_solid_button.on_click(lambda b: on_import_solid(compound))
-        import_liquid_button.on_click(lambda b: on_import_liquid(compound))
+        import_solid_button.on_click(partial(_click_handler, on_import_solid, compound))
+        import_liquid_button.on_click(partial(_click_handler, on_import_liquid, compound))
         
         # Arrange buttons
         buttons = widgets.VBox([
@@ -184,4 +256,4 @@ class UIComponents:
         return widgets.VBox([
             result,
             widgets.HTML("<hr style='margin: 10px 0;'>")
-        ], layout=widgets.Layout(margin="5px 0"))
+        ], layout=_SEARCH_RESULT_LAYOUT)
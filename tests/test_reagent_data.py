@@ -0,0 +1,191 @@
+import json
+import os
+import time
+
+import pytest
+
+from mechwolf.DataEntry.ReagentUI import DataManager, PubChemService as pubchem
+from mechwolf.DataEntry.ReagentUI.DataManager import ReagentDataManager
+from mechwolf.DataEntry.ReagentUI.PubChemService import PubChemService
+from mechwolf.DataEntry.ReagentUI.ReagentUtils import smiles_looks_plausible
+
+
+def solid(name="A", eq=1.0):
+    return {"name": name, "eq": eq, "molecular weight (in g/mol)": 100.0, "syringe": 1}
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    dm = ReagentDataManager(str(tmp_path / "reagents.json"))
+    yield dm
+    dm.flush()
+
+
+def test_add_update_delete(manager):
+    a = solid("A")
+    manager.add_reagent(a, "solid")
+    assert manager.data["solid reagents"] == [a]
+    assert manager.get_reagent_type(a) == "solid"
+
+    b = solid("B", eq=2.0)
+    manager.update_reagent(a, b, "solid")
+    assert manager.data["solid reagents"] == [b]
+    assert manager.get_reagent_type(b) == "solid"
+
+    manager.delete_reagent(b)
+    assert manager.data["solid reagents"] == []
+    assert not manager.has_limiting_reagent()
+
+
+def test_add_same_name_replaces(manager):
+    manager.add_reagent(solid("A", eq=2.0), "solid")
+    manager.add_reagent(solid("A", eq=1.0), "solid")
+    assert [r["eq"] for r in manager.data["solid reagents"]] == [1.0]
+    assert manager.has_limiting_reagent()
+
+
+def test_delete_by_equal_copy_clears_index(manager):
+    liquid = dict(solid("L"), **{"density (in g/mL)": 0.8})
+    manager.add_reagent(liquid, "liquid")
+    manager.delete_reagent(dict(liquid))
+    assert manager.data["liquid reagents"] == []
+    assert manager._index == {}
+
+
+def test_save_is_debounced(manager, monkeypatch):
+    monkeypatch.setattr(DataManager, "SAVE_DELAY", 0.05)
+    manager.add_reagent(solid("A"), "solid")
+    manager.add_reagent(solid("B"), "solid")
+    assert not os.path.exists(manager.data_file)
+
+    deadline = time.time() + 5
+    while not os.path.exists(manager.data_file) and time.time() < deadline:
+        time.sleep(0.01)
+    assert [r["name"] for r in read(manager.data_file)["solid reagents"]] == ["A", "B"]
+
+
+def test_flush_writes_pending_save(manager):
+    manager.add_reagent(solid("A"), "solid")
+    manager.flush()
+    assert [r["name"] for r in read(manager.data_file)["solid reagents"]] == ["A"]
+
+
+def test_save_recreates_missing_file(manager):
+    manager.save_data()
+    os.remove(manager.data_file)
+    manager.save_data()
+    assert read(manager.data_file) == {"solid reagents": [], "liquid reagents": []}
+
+
+def test_save_restores_externally_rewritten_file(manager):
+    manager.save_data()
+    with open(manager.data_file, "w") as f:
+        json.dump({"other": True}, f)
+    manager.save_data()
+    assert read(manager.data_file) == {"solid reagents": [], "liquid reagents": []}
+
+
+def test_save_numpy_scalars(manager):
+    np = pytest.importorskip("numpy")
+    manager.data["mass scale (in mg)"] = np.float64(2.5)
+    manager.save_data()
+    assert read(manager.data_file)["mass scale (in mg)"] == 2.5
+
+
+def test_reload(manager):
+    manager.add_reagent(solid("A"), "solid")
+    manager.flush()
+    reloaded = ReagentDataManager(manager.data_file)
+    assert reloaded.get_reagent_type(reloaded.data["solid reagents"][0]) == "solid"
+
+
+def test_cache_key():
+    assert PubChemService._cache_key("Ethanol", "name") == "name:ethanol"
+    assert PubChemService._cache_key("50-00-0", "cas") == "cas:50-00-0"
+    assert PubChemService._cache_key("CCO", "smiles") == "smiles:CCO"
+    assert PubChemService._cache_key("InChI=1S/CH4O", "inchi") == "inchi:InChI=1S/CH4O"
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        if url.endswith("/cids/JSON"):
+            return FakeResponse({"IdentifierList": {"CID": [1]}})
+        if "/property/" in url:
+            return FakeResponse(
+                {"PropertyTable": {"Properties": [{"CID": 1, "MolecularWeight": "46.07"}]}}
+            )
+        return FakeResponse({})
+
+    post = get
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(pubchem, "CACHE_SIZE", 2)
+    service = PubChemService()
+    session = FakeSession()
+    service._session = lambda: session
+
+    service.search("a", "name")
+    service.search("b", "name")
+    service.search("a", "name")  # a is now the most recently used
+    service.search("c", "name")
+    assert list(service.cache) == ["name:a", "name:c"]
+
+    calls = session.calls
+    assert service.search("A", "name")[0]["molecular_weight"] == 46.07
+    assert session.calls == calls
+
+
+def test_cache_file_skips_expired_entries(tmp_path):
+    cache_file = tmp_path / "cache.json"
+    now = time.time()
+    cache_file.write_text(json.dumps({
+        "name:old": {"ts": now - pubchem.CACHE_TTL - 1, "results": []},
+        "name:new": {"ts": now, "results": [{"cid": 1}]},
+    }))
+    service = PubChemService(str(cache_file))
+    assert list(service.cache) == ["name:new"]
+    assert service.search("new", "name") == [{"cid": 1}]
+
+
+def test_cache_file_round_trip(tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    service = PubChemService(cache_file)
+    service._session = FakeSession
+    results = service.search("ethanol", "name")
+    assert PubChemService(cache_file).cache["name:ethanol"]["results"] == results
+
+
+@pytest.mark.parametrize(
+    "smiles",
+    ["CCO", "c1ccccc1", "[13CH4]", "C/C=C\\C", "[Na+].[Cl-]", "C%10CC%10", "*C"],
+)
+def test_smiles_looks_plausible(smiles):
+    assert smiles_looks_plausible(smiles)
+
+
+@pytest.mark.parametrize(
+    "smiles", ["", "CC(", "CC=", "C[C", "C)", "C C", "C[N[H]]", "C]"]
+)
+def test_smiles_looks_implausible(smiles):
+    assert not smiles_looks_plausible(smiles)